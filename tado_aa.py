@@ -3,22 +3,146 @@
 import sys
 import os
 import time
+import atexit
+import queue
 import threading
 import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 from PyTado.interface import Tado
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
 
+class CachedTado:
+    '''
+    Proxy around a Tado instance caching the results of selected get_* calls
+    '''
+    CACHE_MAX_SIZE = 1000
+
+    def __init__(self, tado: Tado, ttls: dict, keep_on_write=()):
+        '''
+        Initialize the CachedTado class
+
+        :param tado: Tado instance to wrap
+        :param ttls: Seconds a cached result stays valid, by method name. Other methods are not cached.
+        :param keep_on_write: Cached methods whose results no set_*/reset_* call can make stale
+        '''
+        self.tado = tado
+        self.ttls = ttls
+        self.keep_on_write = frozenset(keep_on_write)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._cache = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._call_lock = None
+        self._lock_token_refresh()
+
+    def _lock_token_refresh(self):
+        '''
+        PyTado refreshes its access token without a lock, so concurrent calls hitting an
+        expired token would all spend the same refresh token. Serialize the refresh, or
+        every call if the refresh method can't be found.
+        '''
+        http = getattr(self.tado, "_http", None)
+        refresh_token = getattr(http, "_refresh_token", None)
+        if not callable(refresh_token):
+            self._call_lock = threading.Lock()
+            return
+
+        refresh_lock = threading.Lock()
+
+        def locked_refresh_token(*args, **kwargs):
+            with refresh_lock:
+                return refresh_token(*args, **kwargs)
+
+        http._refresh_token = locked_refresh_token
+
+    def _serialized(self, method):
+        '''
+        Wrap a method so that only one call runs at a time
+        '''
+        def serialized(*args, **kwargs):
+            with self._call_lock:
+                return method(*args, **kwargs)
+        return serialized
+
+    def __getattr__(self, name):
+        attr = getattr(self.tado, name)
+        if not callable(attr):
+            return attr
+        if self._call_lock is not None:
+            attr = self._serialized(attr)
+        if name in self.ttls:
+            return lambda *args: self._cached_call(name, attr, args)
+        if name.startswith(("set_", "reset_")):
+            return lambda *args, **kwargs: self._write_call(attr, args, kwargs)
+        return attr
+
+    def _cached_call(self, name, method, args):
+        '''
+        Return the cached result of a get_* call, fetching it if missing or expired
+        '''
+        key = (name, args)
+        now = time.monotonic()
+        with self._lock:
+            if key in self._cache:
+                timestamp, result = self._cache[key]
+                if now - timestamp < self.ttls[name]:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._cache[key]
+            self.misses += 1
+            generation = self._generation
+
+        result = method(*args)
+
+        with self._lock:
+            # Don't store a result fetched before a concurrent write cleared the cache
+            if generation == self._generation:
+                self._cache[key] = (now, result)
+                if len(self._cache) > self.CACHE_MAX_SIZE:
+                    self._cache.popitem(last=False)
+        return result
+
+    def _write_call(self, method, args, kwargs):
+        '''
+        Forward a set_*/reset_* call and invalidate the results it can make stale
+        '''
+        try:
+            return method(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.writes += 1
+            self.clear_cache(keep=self.keep_on_write)
+
+    def clear_cache(self, keep=()):
+        '''
+        Drop the cached results, except those of the methods in keep
+        '''
+        with self._lock:
+            for key in [key for key in self._cache if key[0] not in keep]:
+                del self._cache[key]
+            self._generation += 1
+
 class TadoController:
     '''
     TadoController class to control Tado devices
     '''
     # Configuration settings
-    CHECKING_INTERVAL = 30.0
+    MIN_CHECKING_INTERVAL = 10.0
+    MAX_CHECKING_INTERVAL = 5 * 60.0
+    CHECKING_INTERVAL_FACTOR = 1.5
     ERROR_INTERVAL = 30.0
+    ZONES_CACHE_TTL = 60 * 60.0
     MIN_TEMP = 5
     MAX_TEMP = 25
     MAX_INTERNAL_TEMP = 26.0
@@ -28,6 +152,8 @@ class TadoController:
     LOGFILE_NAME = "logfile.log"
     LOGFILE_PATH = os.getenv("LOGFILE_PATH")
     RETENTION_LOGFILE_DAYS = 7
+    HTTP_POOL_SIZE = 32
+    HTTP_RETRIES = 3
 
     def __init__(self, username: str, password: str):
         '''
@@ -40,81 +166,162 @@ class TadoController:
         self.password = password
         self.last_message = ""
         self.date_last_message = datetime.now().day
+        self.timestamp_second = None
+        self.timestamp = ""
+        self.log_file = None
+        self.log_path = os.path.join(self.LOGFILE_PATH, self.LOGFILE_NAME) if self.LOGFILE_PATH else None
         self.active_reschedules = {}
-        self.stop_flags = {}
-        self.t: Tado | None = None
+        self.reschedule_lock = threading.Lock()
+        self.message_lock = threading.Lock()
+        self.zone_pool: ThreadPoolExecutor | None = None
+        self.checking_interval = self.MIN_CHECKING_INTERVAL
+        self.t: CachedTado | None = None
         self.devices_home = []
+        self.connection_error_message = f"\nConnection Error, retrying in {self.ERROR_INTERVAL} sec.."
+        self.connection_error = False
+        self.log_queue = queue.Queue()
+        threading.Thread(target=self.write_messages, daemon=True).start()
+        # Flush the pending messages before the interpreter exits
+        atexit.register(self.log_queue.join)
 
     def login(self):
         '''
         Login to a Tado account
         '''
-        try:
-            self.t = Tado(self.username, self.password, None, False)
-
-            if "Connection Error" in self.last_message:
-                self.print_message("Connection established, continuing..")
+        while True:
+            try:
+                self.t = CachedTado(Tado(self.username, self.password, None, False), {"get_zones": self.ZONES_CACHE_TTL}, keep_on_write={"get_zones"})
+                self.configure_session()
 
-        except KeyboardInterrupt:
-            self.print_message("Interrupted by user.")
-            sys.exit(0)
+                if self.connection_error:
+                    self.connection_error = False
+                    self.print_message("Connection established, continuing..")
+                return
 
-        except Exception as e:
-            if "access_token" in str(e):
-                self.print_message("Login error, check credentials!")
+            except KeyboardInterrupt:
+                self.print_message("Interrupted by user.")
                 sys.exit(0)
-            else:
-                self.print_message(
-                    traceback.format_exc() + "\nConnection Error, retrying in " + str(self.ERROR_INTERVAL) + " sec.."
-                )
-                time.sleep(self.ERROR_INTERVAL)
-                self.login()
+
+            except Exception as e:
+                if "access_token" in str(e):
+                    self.print_message("Login error, check credentials!")
+                    sys.exit(0)
+                else:
+                    self.print_connection_error()
+                    time.sleep(self.ERROR_INTERVAL)
+
+    def configure_session(self):
+        '''
+        Tune the HTTP session used by PyTado: enough pooled keep-alive connections per
+        host for the zone threads and retries with backoff on 502/503/504 responses.
+        PyTado replaces its session on token refresh and connection errors, so the
+        tuning is applied again whenever that happens.
+        '''
+        http = getattr(self.t.tado, "_http", None)
+        if not isinstance(getattr(http, "_session", None), Session):
+            return
+
+        self.tune_session(http._session)
+
+        create_session = getattr(http, "_create_session", None)
+        if callable(create_session):
+            def tuned_create_session(*args, **kwargs):
+                session = create_session(*args, **kwargs)
+                self.tune_session(session)
+                return session
+
+            http._create_session = tuned_create_session
+
+        # Sessions replaced without _create_session() are tuned after the request
+        request = http.request
+
+        def tuned_request(*args, **kwargs):
+            try:
+                return request(*args, **kwargs)
+            finally:
+                self.tune_session(http._session)
+
+        http.request = tuned_request
+
+    def tune_session(self, session):
+        '''
+        Mount the tuned HTTPS adapter on a session, unless already done
+        '''
+        if not isinstance(session, Session) or getattr(session, "tado_aa_tuned", False):
+            return
+
+        adapter = HTTPAdapter(
+            pool_maxsize=self.HTTP_POOL_SIZE,
+            # Connection errors are already retried by PyTado itself
+            max_retries=Retry(
+                total=self.HTTP_RETRIES,
+                connect=0,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.tado_aa_tuned = True
 
     def home_status(self):
         '''
         Check home status. If no devices are at home, activate AWAY mode.
         '''
-        try:
-            home_state = self.t.get_home_state()["presence"]
-
-            if not self.devices_home:
-                for device in self.t.get_mobile_devices():
-                    if device["settings"]["geoTrackingEnabled"] and device["location"]["atHome"]:
-                        self.devices_home.append(device["name"])
-
-            if "Connection Error" in self.last_message:
-                self.print_message("Successfully got the location, continuing..")
-
-            if self.devices_home and home_state == "HOME":
-                self.manage_home_mode(len(self.devices_home))
-            elif not self.devices_home and home_state == "AWAY":
-                self.print_message("No devices at home, activating AWAY mode.")
-                self.t.set_away()
-            elif not self.devices_home and home_state == "HOME":
-                self.print_message("Activating AWAY mode.")
-                self.t.set_away()
-            elif self.devices_home and home_state == "AWAY":
-                self.manage_home_mode(len(self.devices_home))
-
-            self.print_message("Waiting for a change in device location..")
-            self.print_message(f"Temp Limit is {'ON' if self.ENABLE_TEMP_LIMIT else 'OFF'}, min Temp({self.MIN_TEMP}), max Temp({self.MAX_TEMP})")
-            time.sleep(1)
-            self.engine()
-
-        except KeyboardInterrupt:
-            self.print_message("Interrupted by user.")
-            sys.exit(0)
-
-        except Exception as e:
-            if "location" in str(e):
-                self.print_message("Waiting for device location.")
+        while True:
+            try:
+                home_state = self.t.get_home_state()["presence"]
+
+                devices_located = self.update_devices_home(self.t.get_mobile_devices())
+
+                if self.connection_error:
+                    self.connection_error = False
+                    self.print_message("Successfully got the location, continuing..")
+
+                if not devices_located:
+                    self.print_message("Waiting for device location.")
+                elif self.devices_home and home_state == "HOME":
+                    self.manage_home_mode(len(self.devices_home))
+                elif not self.devices_home and home_state == "AWAY":
+                    self.print_message("No devices at home, activating AWAY mode.")
+                    self.t.set_away()
+                elif not self.devices_home and home_state == "HOME":
+                    self.print_message("Activating AWAY mode.")
+                    self.t.set_away()
+                elif self.devices_home and home_state == "AWAY":
+                    self.manage_home_mode(len(self.devices_home))
+
+                self.print_message("Waiting for a change in device location..")
+                self.print_message(f"Temp Limit is {'ON' if self.ENABLE_TEMP_LIMIT else 'OFF'}, min Temp({self.MIN_TEMP}), max Temp({self.MAX_TEMP})")
                 time.sleep(1)
-            else:
-                self.print_message(
-                    traceback.format_exc() + "\nConnection Error, retrying in " + str(self.ERROR_INTERVAL) + " sec.."
-                )
-                time.sleep(self.ERROR_INTERVAL)
-                self.home_status()
+                self.engine()
+                return
+
+            except KeyboardInterrupt:
+                self.print_message("Interrupted by user.")
+                self.cancel_reschedules()
+                sys.exit(0)
+
+            except Exception as e:
+                if "location" in str(e):
+                    self.print_message("Waiting for device location.")
+                    time.sleep(1)
+                else:
+                    self.print_connection_error()
+                    time.sleep(self.ERROR_INTERVAL)
+
+    def update_devices_home(self, mobile_devices):
+        '''
+        Refresh the list of geotracked devices that are at home.
+        Returns False, leaving the list untouched, if the location of a geotracked device is unknown.
+        '''
+        geotracked_devices = [device for device in mobile_devices if device["settings"]["geoTrackingEnabled"]]
+        if not all(device.get("location") for device in geotracked_devices):
+            return False
+
+        self.devices_home[:] = [device["name"] for device in geotracked_devices if device["location"]["atHome"]]
+        return True
 
     def manage_home_mode(self, num_devices):
         '''
@@ -129,168 +336,270 @@ class TadoController:
 
     def reset_to_schedule(self, zone_id, zone_name):
         '''
-        Reset the zone to the schedule. To be launched in a separate thread.
+        Reset the zone to the schedule. Run by the zone reschedule timer.
         '''
         try:
-            while not self.stop_flags.get(zone_name, False):
-                if time.sleep(0.1):
-                    return
+            self.t.reset_zone_overlay(zone_id)
+            state = self.t.get_state(zone_id)
+            self.print_message(
+                f"Room {state['name']} resumed schedule "
+                f"{state['setting']['power']}{' (set to ' + str(state['setting']['temperature']['value']) + ')' if state['setting']['temperature'] is not None else ''}"
+            )
 
-                remaining_time = self.RESCHEDULE_TIMER
-                while remaining_time > 0 and not self.stop_flags.get(zone_name, False):
-                    time.sleep(min(1, remaining_time))
-                    remaining_time -= 1
+        finally:
+            with self.reschedule_lock:
+                if self.active_reschedules.get(zone_name) is threading.current_thread():
+                    del self.active_reschedules[zone_name]
 
-                if self.stop_flags.get(zone_name, False):
-                    self.print_message(f"Room {self.t.get_state(zone_id)['name']} reschedule stopped")
-                    return
+    def cancel_reschedules(self):
+        '''
+        Cancel all pending reschedule timers
+        '''
+        with self.reschedule_lock:
+            reschedules = list(self.active_reschedules.values())
+            self.active_reschedules.clear()
+        for reschedule in reschedules:
+            reschedule.cancel()
 
-                self.t.reset_zone_overlay(zone_id)
+    def check_open_window(self, zone_id, zone_name, state):
+        '''
+        Activate OpenWindow mode if an open window is detected in the zone.
+        Returns True if an open window was detected.
+        '''
+        # Same checks as PyTado's get_open_window_detected(), without fetching the state again
+        if "openWindowDetected" in state:
+            open_window_detected = state["openWindowDetected"]
+        else:
+            open_window = state.get("openWindow")
+            open_window_detected = bool(open_window) and "activated" in open_window
+        if not open_window_detected:
+            return False
+
+        if "activated" in state["openWindow"] and state['openWindow']['activated']:
+            self.print_message(f"{zone_name}: Open window detected, OpenWindow mode already activated.")
+            return True
+        self.print_message(f"{zone_name}: Open window detected, activating OpenWindow mode.")
+        self.t.set_open_window(zone_id)
+        self.print_message("Done!")
+        return True
+
+    def check_manual_control(self, zone_id, zone_name, state):
+        '''
+        Start or cancel the reschedule timer of a manually controlled zone.
+        '''
+        if state["manualControlTermination"] and state["setting"]["power"] == "ON":
+            with self.reschedule_lock:
+                if zone_name not in self.active_reschedules or not self.active_reschedules[zone_name].is_alive():
+                    self.print_message(
+                        f"Temperature detected {state['setting']['power']} (set to {state['setting']['temperature']['value']}) for room {zone_name} (ID: {zone_id}). "
+                        f"Resuming schedule in {self.RESCHEDULE_TIMER//60} minutes"
+                    )
+                    self.active_reschedules[zone_name] = threading.Timer(self.RESCHEDULE_TIMER, self.reset_to_schedule, args=(zone_id, zone_name,))
+                    self.active_reschedules[zone_name].start()
+
+        if state["manualControlTermination"] and state["setting"]["power"] == "OFF":
+            with self.reschedule_lock:
+                reschedule = self.active_reschedules.pop(zone_name, None)
+            if reschedule is not None and reschedule.is_alive():
+                self.print_message(f"Room {zone_name} heating is OFF, stopping reschedule timer")
+                reschedule.cancel()
+                self.print_message(f"Room {zone_name} reschedule stopped")
+
+    def check_temp_limit(self, zone_id, zone_name, state):
+        '''
+        Keep the set temperature of a heating zone between MIN_TEMP and MAX_TEMP.
+        '''
+        if (
+            state["heatingPower"]["percentage"] > 0
+            and state["setting"]["power"] == "ON"
+            and state["setting"]["temperature"] is not None
+        ):
+            set_temp = state["setting"]["temperature"]["value"]
+
+            if set_temp > self.MAX_TEMP:
+                self.t.set_zone_overlay(zone_id, "MANUAL", self.MAX_TEMP)
                 self.print_message(
-                    f"Room {self.t.get_state(zone_id)['name']} resumed schedule "
-                    f"{self.t.get_state(zone_id)['setting']['power']}{' (set to ' + str(self.t.get_state(zone_id)['setting']['temperature']['value']) + ')' if self.t.get_state(zone_id)['setting']['temperature'] is not None else ''}"
+                    f"{zone_name}: Set Temp ({set_temp}) is higher than the desired max Temp({self.MAX_TEMP}), set {zone_name} to {self.MAX_TEMP} degrees!"
+                )
+            elif set_temp < self.MIN_TEMP:
+                self.t.set_zone_overlay(zone_id, 0, self.MIN_TEMP)
+                self.print_message(
+                    f"{zone_name}: Set Temp ({set_temp}) is lower than the desired min Temp({self.MIN_TEMP}), set {zone_name} to {self.MIN_TEMP} degrees!"
                 )
 
-        finally:
-            if zone_name in self.active_reschedules:
-                del self.active_reschedules[zone_name]
-            if zone_name in self.stop_flags:
-                del self.stop_flags[zone_name]
-
-    def engine(self):
+    def get_zone_states(self):
         '''
-        Main engine to control the Tado devices
+        Get the state of every zone with a single request, keyed by zone id
         '''
-        while True:
-            try:
-                for zone in self.t.get_zones():
-                    zone_id = zone["roomId"]
-                    zone_name = zone["roomName"]
-
-                    if self.t.get_open_window_detected(zone_id)["openWindowDetected"]:
-                        if "activated" in self.t.get_state(zone_id)["openWindow"] and self.t.get_state(zone_id)['openWindow']['activated']:
-                            self.print_message(f"{zone_name}: Open window detected, OpenWindow mode already activated.")
-                            continue
-                        self.print_message(f"{zone_name}: Open window detected, activating OpenWindow mode.")
-                        self.t.set_open_window(zone_id)
-                        self.print_message("Done!")
-                        continue
-
-                    if self.t.get_state(zone_id)['sensorDataPoints']['insideTemperature']['value'] >= self.MAX_INTERNAL_TEMP:
-                        self.t.reset_zone_overlay(zone_id)
-
-                    if self.t.get_state(zone_id)["manualControlTermination"] and self.t.get_state(zone_id)["setting"]["power"] == "ON":
-                        if zone_name not in self.active_reschedules or not self.active_reschedules[zone_name].is_alive():
-                            self.print_message(
-                                f"Temperature detected {self.t.get_state(zone_id)['setting']['power']} (set to {self.t.get_state(zone_id)['setting']['temperature']['value']}) for room {zone_name} (ID: {zone_id}). "
-                                f"Resuming schedule in {self.RESCHEDULE_TIMER//60} minutes"
-                            )
-                            self.active_reschedules[zone_name] = threading.Thread(target=self.reset_to_schedule, args=(zone_id, zone_name,))
-                            self.stop_flags[zone_name] = False
-                            self.active_reschedules[zone_name].start()
-
-                    if self.t.get_state(zone_id)["manualControlTermination"] and self.t.get_state(zone_id)["setting"]["power"] == "OFF":
-                        if zone_name in self.active_reschedules and self.active_reschedules[zone_name].is_alive():
-                            self.print_message(f"Room {zone_name} heating is OFF, stopping reschedule thread")
-                            self.stop_flags[zone_name] = True
-                            if zone_name in self.active_reschedules:
-                                self.active_reschedules[zone_name].join(timeout=self.CHECKING_INTERVAL + 1)
-
-                    if self.ENABLE_TEMP_LIMIT:
-                        if (
-                            self.t.get_state(zone_id)["heatingPower"]["percentage"] > 0
-                            and self.t.get_state(zone_id)["setting"]["power"] == "ON"
-                            and self.t.get_state(zone_id)["setting"]["temperature"] is not None
-                        ):
-                            set_temp = self.t.get_state(zone_id)["setting"]["temperature"]["value"]
-
-                            if set_temp > self.MAX_TEMP:
-                                self.t.set_zone_overlay(zone_id, "MANUAL", self.MAX_TEMP)
-                                self.print_message(
-                                    f"{zone_name}: Set Temp ({set_temp}) is higher than the desired max Temp({self.MAX_TEMP}), set {zone_name} to {self.MAX_TEMP} degrees!"
-                                )
-                            elif set_temp < self.MIN_TEMP:
-                                self.t.set_zone_overlay(zone_id, 0, self.MIN_TEMP)
-                                self.print_message(
-                                    f"{zone_name}: Set Temp ({set_temp}) is lower than the desired min Temp({self.MIN_TEMP}), set {zone_name} to {self.MIN_TEMP} degrees!"
-                                )
+        zone_states = self.t.get_zone_states()
+        if isinstance(zone_states, dict):
+            zone_states = zone_states["zoneStates"]
+        if isinstance(zone_states, dict):
+            # Classic API: {"<zone id>": state}
+            return {int(zone_id): state for zone_id, state in zone_states.items()}
+        # Tado X API: list of room states
+        return {state["id"]: state for state in zone_states}
+
+    def process_zone(self, zone, state):
+        '''
+        Check a single zone. Runs in the zone thread pool.
+        '''
+        zone_id = zone["roomId"]
+        zone_name = zone["roomName"]
 
-                home_state = self.t.get_home_state()["presence"]
+        if self.check_open_window(zone_id, zone_name, state):
+            return
 
-                self.devices_home.clear()
+        if state['sensorDataPoints']['insideTemperature']['value'] >= self.MAX_INTERNAL_TEMP:
+            self.t.reset_zone_overlay(zone_id)
+            state = self.t.get_state(zone_id)
 
-                if not self.devices_home:
-                    for device in self.t.get_mobile_devices():
-                        if device["settings"]["geoTrackingEnabled"] and device["location"]["atHome"]:
-                            self.devices_home.append(device["name"])
+        self.check_manual_control(zone_id, zone_name, state)
+
+        if self.ENABLE_TEMP_LIMIT:
+            self.check_temp_limit(zone_id, zone_name, state)
+
+    def engine(self):
+        '''
+        Main engine to control the Tado devices. Polls every MIN_CHECKING_INTERVAL
+        after a change, backing off up to MAX_CHECKING_INTERVAL while nothing happens.
+        '''
+        # Activity is measured against the end of the previous cycle, so writes and
+        # timers firing during the sleep count too
+        writes = self.t.writes
+        with self.reschedule_lock:
+            reschedules = set(self.active_reschedules)
 
-                if "Connection Error" in self.last_message:
+        while True:
+            try:
+                zones = self.t.get_zones()
+                zone_states = self.get_zone_states()
+                if self.zone_pool is None:
+                    # Two extra workers for the home state and mobile devices requests
+                    self.zone_pool = ThreadPoolExecutor(max_workers=min(32, len(zones) + 2))
+                home_state_future = self.zone_pool.submit(self.t.get_home_state)
+                mobile_devices_future = self.zone_pool.submit(self.t.get_mobile_devices)
+                checked_zones = []
+                for zone in zones:
+                    if zone["roomId"] in zone_states:
+                        checked_zones.append(zone)
+                    else:
+                        self.print_message(f"{zone['roomName']}: No state returned for room (ID: {zone['roomId']}), skipping.")
+                list(self.zone_pool.map(self.process_zone, checked_zones, [zone_states[zone["roomId"]] for zone in checked_zones]))
+
+                home_state = home_state_future.result()["presence"]
+
+                devices_located = self.update_devices_home(mobile_devices_future.result())
+
+                if self.connection_error:
+                    self.connection_error = False
                     self.print_message("Successfully got the location, continuing..")
                     self.print_message("Waiting for a change in device location..")
 
-                if self.devices_home and home_state == "AWAY":
+                if not devices_located:
+                    self.print_message("Waiting for device location.")
+
+                elif self.devices_home and home_state == "AWAY":
                     self.manage_home_mode(len(self.devices_home))
 
                 elif not self.devices_home and home_state == "HOME":
                     self.print_message("Activating AWAY mode.")
                     self.t.set_away()
 
-                self.devices_home.clear()
-                time.sleep(self.CHECKING_INTERVAL)
+                current_writes = self.t.writes
+                with self.reschedule_lock:
+                    current_reschedules = set(self.active_reschedules)
+                if current_writes != writes or current_reschedules != reschedules:
+                    self.checking_interval = self.MIN_CHECKING_INTERVAL
+                else:
+                    self.checking_interval = min(self.checking_interval * self.CHECKING_INTERVAL_FACTOR, self.MAX_CHECKING_INTERVAL)
+                writes = current_writes
+                reschedules = current_reschedules
+                time.sleep(self.checking_interval)
 
             except KeyboardInterrupt:
                 self.print_message("Interrupted by user.")
+                self.print_message(f"Zone list cache: {self.t.hits} hits, {self.t.misses} misses")
+                self.cancel_reschedules()
                 sys.exit(0)
 
             except Exception as e:
                 if "location" in str(e):
                     self.print_message("Waiting for device location.")
                 else:
-                    self.print_message(
-                        traceback.format_exc() + "\nConnection Error, retrying in " + str(self.ERROR_INTERVAL) + " sec.."
-                    )
+                    self.print_connection_error()
                     time.sleep(self.ERROR_INTERVAL)
 
+    def print_connection_error(self):
+        '''
+        Print the current exception as a connection error and remember it until the connection recovers
+        '''
+        self.print_message(traceback.format_exc() + self.connection_error_message)
+        self.connection_error = True
+
     def print_message(self, message):
+        '''
+        Queue a message to be printed to the console and saved to the log file
+        '''
+        with self.message_lock:
+            if message == self.last_message:
+                return
+            self.last_message = message
+            self.log_queue.put_nowait((datetime.now(), message))
+
+    def write_messages(self):
+        '''
+        Write the queued messages. Runs in the log writer thread.
+        '''
+        while True:
+            now, message = self.log_queue.get()
+            try:
+                self.write_message(now, message)
+            except Exception:
+                sys.stdout.write(traceback.format_exc() + "\n")
+            finally:
+                self.log_queue.task_done()
+
+    def write_message(self, now, message):
         '''
         Print a formatted message to the console and save it to a log file
         '''
-        if message != self.last_message:
-            sys.stdout.write(datetime.now().strftime("%d-%m-%Y %H:%M:%S") + " # " + message + "\n")
+        second = int(now.timestamp())
+        if second != self.timestamp_second:
+            self.timestamp_second = second
+            self.timestamp = now.strftime("%d-%m-%Y %H:%M:%S")
 
-            if self.SAVE_LOGS:
-                try:
-                    with open(os.path.join(self.LOGFILE_PATH, self.LOGFILE_NAME), "a") as log:
-                        log.write(datetime.now().strftime("%d-%m-%Y %H:%M:%S") + " # " + message + "\n")
-                except Exception as e:
-                    sys.stdout.write(datetime.now().strftime("%d-%m-%Y %H:%M:%S") + " # " + traceback.format_exc() + str(e) + "\n")
+        sys.stdout.write(self.timestamp + " # " + message + "\n")
 
-            if datetime.now().day != self.date_last_message:
-                self.rotate_log()
+        if self.SAVE_LOGS:
+            try:
+                if self.log_file is None:
+                    self.log_file = open(self.log_path, "a", buffering=1)
+                self.log_file.write(self.timestamp + " # " + message + "\n")
+            except Exception as e:
+                sys.stdout.write(self.timestamp + " # " + traceback.format_exc() + str(e) + "\n")
 
-            self.date_last_message = datetime.now().day
-            self.last_message = message
+        if now.day != self.date_last_message:
+            self.rotate_log(now)
+
+        self.date_last_message = now.day
 
-    def rotate_log(self):
+    def rotate_log(self, now):
         '''
         Rotate the log file based on the date
         '''
-        timestamp = datetime.now().strftime("%Y-%m-%d")
+        timestamp = now.strftime("%Y-%m-%d")
         new_logfile = self.LOGFILE_NAME.replace(".log", f"_{timestamp}.log")
-        os.rename(os.path.join(self.LOGFILE_PATH, self.LOGFILE_NAME), os.path.join(self.LOGFILE_PATH, new_logfile))
-        open(os.path.join(self.LOGFILE_PATH, self.LOGFILE_NAME), "w").close()
-
-        while len([f for f in os.listdir(self.LOGFILE_PATH) if "logfile" in f]) > self.RETENTION_LOGFILE_DAYS:
-            logfiles = [f for f in os.listdir(self.LOGFILE_PATH) if "logfile" in f]
-            oldest_log_time = None
-            oldest_log_file = None
-            for f in logfiles:
-                file_date = os.path.getmtime(os.path.join(self.LOGFILE_PATH, f))
-                if oldest_log_time is None or file_date < oldest_log_time:
-                    oldest_log_time = file_date
-                    oldest_log_file = f
-
-            os.remove(os.path.join(self.LOGFILE_PATH, oldest_log_file))
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+        os.rename(self.log_path, os.path.join(self.LOGFILE_PATH, new_logfile))
+        self.log_file = open(self.log_path, "w", buffering=1)
+
+        with os.scandir(self.LOGFILE_PATH) as entries:
+            logfiles = sorted((entry for entry in entries if "logfile" in entry.name), key=lambda entry: entry.stat().st_mtime)
+        for old_logfile in logfiles[:max(0, len(logfiles) - self.RETENTION_LOGFILE_DAYS)]:
+            os.remove(old_logfile.path)
 
 if __name__ == "__main__":
     controller = TadoController(username=os.getenv("TADO_USERNAME"), password=os.getenv("TADO_PASSWORD"))